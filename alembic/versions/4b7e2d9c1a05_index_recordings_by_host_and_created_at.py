@@ -0,0 +1,50 @@
+"""Index recordings by host user and creation time
+
+Revision ID: 4b7e2d9c1a05
+Revises: 18c9e32b0ecf
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2d9c1a05'
+down_revision = '18c9e32b0ecf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so the recordings table stays writable; the
+    # composite index also covers lookups on host_user_id alone
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_recordings_host_user_id_created_at',
+            'recordings',
+            ['host_user_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f('ix_recordings_host_user_id'),
+            table_name='recordings',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_recordings_host_user_id'),
+            'recordings',
+            ['host_user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_recordings_host_user_id_created_at',
+            table_name='recordings',
+            postgresql_concurrently=True,
+        )
@@ -2,22 +2,55 @@
 FastAPI dependency injection functions.
 """
 import datetime
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Tuple
 
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.services.recording_service import RecordingService
+
+# (epoch second, ISO string) of the last formatted timestamp
+_timestamp_cache: Tuple[int, str] = (0, "")
 
 
 def get_current_timestamp() -> str:
     """
     Dependency that provides the current timestamp in ISO format.
     
+    The formatted string is reused for every call within the same
+    wall-clock second.
+    
     Returns:
         ISO formatted timestamp string
     """
-    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+    global _timestamp_cache
+    
+    second = int(time.time())
+    if second != _timestamp_cache[0]:
+        _timestamp_cache = (
+            second,
+            datetime.datetime.fromtimestamp(second, tz=datetime.timezone.utc).isoformat(),
+        )
+    return _timestamp_cache[1]
 
 
 # Re-export database dependency for easier imports
-get_session = get_db 
\ No newline at end of file
+get_session = get_db 
+
+
+def get_recording_service(db: AsyncSession = Depends(get_db)) -> RecordingService:
+    """
+    Dependency to get a RecordingService bound to the request's session.
+    
+    FastAPI caches dependencies per request, so every consumer within one
+    request shares the same service and session.
+    
+    Args:
+        db: SQLAlchemy async session
+    
+    Returns:
+        RecordingService instance
+    """
+    return RecordingService(db)
@@ -1,9 +1,13 @@
 """
 Metrics endpoint for monitoring application performance.
 """
-from fastapi import APIRouter, Depends, Response
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from starlette.requests import Request
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST, REGISTRY
 from prometheus_client import Counter, Histogram, Gauge
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Set, Tuple
+import asyncio
 import time
 import psutil
 import structlog
@@ -34,6 +38,23 @@ ACTIVE_REQUESTS = Gauge(
     ['method', 'endpoint']
 )
 
+# Upper bound on distinct values of the `endpoint` label
+MAX_ENDPOINT_LABELS = 500
+
+# Route templates already used as label values
+_endpoint_labels: Set[str] = set()
+
+# Full path template of each route object, keyed by id(route)
+_route_templates: Dict[int, str] = {}
+
+# Scope key holding the endpoint label resolved by track_in_progress()
+ENDPOINT_LABEL_SCOPE_KEY = "metrics.endpoint"
+
+# Bound child metrics, keyed by label values, so the request hot path
+# skips labels() lookups
+_request_children: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+_request_count_children: Dict[Tuple[str, str, int], Any] = {}
+
 SYSTEM_MEMORY = Gauge(
     'system_memory_usage_bytes',
     'System memory usage in bytes'
@@ -44,17 +65,220 @@ SYSTEM_CPU = Gauge(
     'System CPU usage percentage'
 )
 
+def _collect_route_templates(routes: Iterable[Any], prefix: str = "") -> Iterator[Tuple[Any, str]]:
+    """
+    Walk the route tree and pair each route with its full path template.
+    
+    Recent FastAPI releases keep included routers nested rather than copying
+    their routes onto the parent, so a matched route's own `path` is relative
+    to its router and the prefixes have to be joined back together.
+    
+    Args:
+        routes: Routes of an application or router
+        prefix: Path prefix accumulated from enclosing routers
+        
+    Yields:
+        Tuples of (route, full path template)
+    """
+    for route in routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            nested_prefix = prefix + route.include_context.prefix
+            yield from _collect_route_templates(included.routes, nested_prefix)
+            yield from _collect_route_templates(
+                getattr(included, "_low_priority_routes", ()), nested_prefix
+            )
+        elif getattr(route, "path", None) is not None:
+            yield route, prefix + route.path
+
+
+def index_route_templates(routes: Iterable[Any]) -> None:
+    """
+    Record the full path template of every route in the tree.
+    
+    Args:
+        routes: Application routes
+    """
+    for route, template in _collect_route_templates(routes):
+        _route_templates.setdefault(id(route), template)
+
+
+def resolve_endpoint_label(request: Request) -> str:
+    """
+    Map a request onto its route template for use as the `endpoint` label.
+    
+    Using the template (e.g. /api/v1/recordings/{room_id}) instead of the raw
+    path keeps label cardinality bounded by the set of declared routes. The
+    matched route is read from the scope, so this must run after routing.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Route template, "unmatched" for unknown paths, or "__other__" once
+        MAX_ENDPOINT_LABELS distinct values have been seen
+    """
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    
+    label = _route_templates.get(id(route))
+    if label is None:
+        # Route registered after the last index; refresh once for it
+        index_route_templates(request.app.routes)
+        label = _route_templates.setdefault(id(route), route.path)
+    
+    if label not in _endpoint_labels:
+        if len(_endpoint_labels) >= MAX_ENDPOINT_LABELS:
+            return "__other__"
+        _endpoint_labels.add(label)
+    return label
+
+
+def request_metric_children(method: str, endpoint: str) -> Tuple[Any, Any]:
+    """
+    Get the ACTIVE_REQUESTS and REQUEST_LATENCY children for a route.
+    
+    Args:
+        method: HTTP method
+        endpoint: Endpoint label from resolve_endpoint_label()
+        
+    Returns:
+        Tuple of (in-progress gauge, latency histogram)
+    """
+    key = (method, endpoint)
+    children = _request_children.get(key)
+    if children is None:
+        children = (
+            ACTIVE_REQUESTS.labels(method, endpoint),
+            REQUEST_LATENCY.labels(method, endpoint),
+        )
+        _request_children[key] = children
+    return children
+
+
+def request_count_child(method: str, endpoint: str, status_code: int):
+    """
+    Get the REQUEST_COUNT child for a route and response status.
+    
+    Args:
+        method: HTTP method
+        endpoint: Endpoint label from resolve_endpoint_label()
+        status_code: HTTP response status code
+        
+    Returns:
+        Bound REQUEST_COUNT counter
+    """
+    key = (method, endpoint, status_code)
+    child = _request_count_children.get(key)
+    if child is None:
+        child = REQUEST_COUNT.labels(method, endpoint, str(status_code))
+        _request_count_children[key] = child
+    return child
+
+
+def prime_request_metrics(routes: Iterable[Any]) -> None:
+    """
+    Pre-bind request metric children for every declared route and method.
+    
+    Args:
+        routes: Application routes
+    """
+    index_route_templates(routes)
+    for route, template in _collect_route_templates(routes):
+        for method in getattr(route, "methods", None) or ():
+            request_metric_children(method, template)
+
+
+async def track_in_progress(request: Request) -> AsyncIterator[None]:
+    """
+    Dependency that counts the request in http_requests_in_progress.
+    
+    Dependencies run after routing, so the endpoint label is resolved here
+    once and left on the scope for the request middleware to reuse for the
+    latency and count series.
+    
+    Args:
+        request: Incoming request
+    """
+    endpoint = resolve_endpoint_label(request)
+    request.scope[ENDPOINT_LABEL_SCOPE_KEY] = endpoint
+    in_progress, _ = request_metric_children(request.method, endpoint)
+    in_progress.inc()
+    try:
+        yield
+    finally:
+        in_progress.dec()
+
+
+# Seconds between background CPU/memory samples
+SYSTEM_SAMPLE_INTERVAL = 2
+
+# Latest system readings, refreshed by sample_system_metrics()
+_system_cache: Dict[str, Any] = {
+    "cpu_percent": 0.0,
+    "memory": None,
+}
+
+
+async def sample_system_metrics():
+    """
+    Background task that keeps CPU and memory readings fresh.
+    
+    psutil.cpu_percent(interval=None) is non-blocking and reports usage since
+    the previous call, so sampling on a fixed interval keeps request handlers
+    from ever sleeping on the event loop.
+    """
+    # The first non-blocking call only primes psutil's counters
+    psutil.cpu_percent(interval=None)
+    
+    while True:
+        try:
+            await asyncio.sleep(SYSTEM_SAMPLE_INTERVAL)
+            
+            memory = psutil.virtual_memory()
+            cpu = psutil.cpu_percent(interval=None)
+            
+            _system_cache["memory"] = memory
+            _system_cache["cpu_percent"] = cpu
+            SYSTEM_MEMORY.set(memory.used)
+            SYSTEM_CPU.set(cpu)
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("System metrics sampling failed", error=str(e))
+
+
+class _SingleFamilyCollector:
+    """Adapter so generate_latest() can render one metric family at a time."""
+    
+    def __init__(self, family):
+        self._family = family
+    
+    def collect(self):
+        return [self._family]
+
+
+def _iter_exposition():
+    """
+    Yield the Prometheus text exposition one metric family at a time.
+    
+    Avoids materialising the whole scrape body in memory before sending it.
+    """
+    for family in REGISTRY.collect():
+        yield generate_latest(_SingleFamilyCollector(family))
+
+
 @router.get("/metrics")
 async def metrics():
     """
     Expose Prometheus metrics endpoint.
-    """
-    # Update system metrics
-    SYSTEM_MEMORY.set(psutil.virtual_memory().used)
-    SYSTEM_CPU.set(psutil.cpu_percent())
     
-    return Response(
-        content=generate_latest(),
+    System gauges are kept up to date by sample_system_metrics().
+    """
+    return StreamingResponse(
+        _iter_exposition(),
         media_type=CONTENT_TYPE_LATEST
     )
 
@@ -63,8 +287,8 @@ async def system_metrics():
     """
     Get detailed system metrics.
     """
-    memory = psutil.virtual_memory()
-    cpu = psutil.cpu_percent(interval=1)
+    memory = _system_cache["memory"] or psutil.virtual_memory()
+    cpu = _system_cache["cpu_percent"]
     disk = psutil.disk_usage('/')
     
     return {
@@ -1,129 +1,77 @@
 """
 Recording endpoints for managing recording sessions.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Form, File, UploadFile
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Form, File, UploadFile, Query, Response
 from app.schemas.recording import (
     RecordingCreateRequest,
     RecordingResponse,
-    GuestTokenRequest,
     GuestTokenResponse,
-    UploadUrlResponse
+    GenerateTokenRequest,
+    UploadUrlResponse,
+    UserType,
+    ROOM_ID_PATTERN,
+    CHUNK_NAME_PATTERN
 )
+from app.api.dependencies import get_recording_service
 from app.services.recording_service import RecordingService
+from app.services.metadata_buffer import buffer_metadata_line
 from app.core.config import settings
-from typing import List
-import logging
-import os
-import tempfile
-import uuid
+from typing import Dict, List, Optional
+import asyncio
 import json
-import aiofiles
+import logging
+import re
+import secrets
 
 logger = logging.getLogger(__name__)
 
 # Create router for recordings
 router = APIRouter()
 
+# TURN configuration is static for the lifetime of the process
+TURN_CREDENTIALS = {
+    "urls": f"turn:{settings.TURN_SERVER_URL}",
+    "username": settings.TURN_SERVER_USERNAME,
+    "credential": settings.TURN_SERVER_CREDENTIAL
+}
+TURN_CREDENTIALS_CACHE_CONTROL = "private, max-age=300"
+# Serialized once so the handler skips response encoding entirely
+TURN_CREDENTIALS_BODY = json.dumps(TURN_CREDENTIALS).encode()
 
-# COMMENTED OUT - OLD LOCAL STORAGE METHOD
-# async def update_metadata_file(room_id: str, user_type: str, chunk_name: str, start_time: float, end_time: float):
-#     """
-#     Update metadata file for later reconstruction of the recording.
-#     
-#     This function maintains a simple text file that tracks all uploaded chunks
-#     with their timing information, enabling proper reconstruction of the final video.
-#     
-#     Args:
-#         room_id: Room ID of the recording
-#         user_type: Type of user ("host" or "guest") 
-#         chunk_name: Name of the uploaded chunk file
-#         start_time: Start time of the chunk in seconds
-#         end_time: End time of the chunk in seconds
-#     """
-#     try:
-#         metadata_file_name = f"{user_type}.txt"
-#         
-#         # Local paths
-#         metadata_dir = f"uploads/recordings/{room_id}/{user_type}"
-#         os.makedirs(metadata_dir, exist_ok=True)
-#         local_metadata_path = os.path.join(metadata_dir, metadata_file_name)
-#         
-#         # Cloudinary path for future use
-#         cloudinary_metadata_path = f"recordings/{room_id}/{user_type}/{metadata_file_name}"
-#         
-#         # Get existing metadata content
-#         existing_txt = ""
-#         
-#         # TODO: Cloudinary fetch (commented for now)
-#         # try:
-#         #     import cloudinary
-#         #     # Get existing metadata from Cloudinary
-#         #     metadata_url = cloudinary.CloudinaryImage(cloudinary_metadata_path).build_url(resource_type="raw")
-#         #     import httpx
-#         #     async with httpx.AsyncClient() as client:
-#         #         response = await client.get(metadata_url)
-#         #         if response.status_code == 200:
-#         #             existing_txt = response.text
-#         # except Exception as e:
-#         #     logger.info(f"No existing metadata file in Cloudinary, creating new one: {e}")
-#         
-#         # For now, read from local file if exists
-#         if os.path.exists(local_metadata_path):
-#             async with aiofiles.open(local_metadata_path, 'r') as f:
-#                 existing_txt = await f.read()
-#         else:
-#             logger.info(f"No existing local metadata file, creating new one")
-#         
-#         # Append new chunk info in CSV format: chunkName,startTime,endTime
-#         updated_txt = existing_txt + f"{chunk_name},{start_time},{end_time}\n"
-#         
-#         # Save updated metadata locally
-#         async with aiofiles.open(local_metadata_path, 'w') as f:
-#             await f.write(updated_txt)
-#         
-#         # TODO: Cloudinary upload (commented for now)
-#         # try:
-#         #     import cloudinary.uploader
-#         #     # Create temporary file for Cloudinary upload
-#         #     import time
-#         #     tmp_filename = f"{user_type}_{room_id}_{int(time.time() * 1000)}.txt"
-#         #     tmp_path = os.path.join(tempfile.gettempdir(), tmp_filename)
-#         #     
-#         #     # Write to temp file
-#         #     with open(tmp_path, 'w') as tmp_file:
-#         #         tmp_file.write(updated_txt)
-#         #     
-#         #     # Upload to Cloudinary
-#         #     result = cloudinary.uploader.upload(
-#         #         tmp_path,
-#         #         resource_type="raw",
-#         #         public_id=cloudinary_metadata_path,
-#         #         overwrite=True
-#         #     )
-#         #     
-#         #     # Clean up temp file
-#         #     os.unlink(tmp_path)
-#         #     
-#         #     logger.info(f"✅ Metadata file uploaded to Cloudinary: {result.get('url')}")
-#         # except Exception as cloudinary_error:
-#         #     logger.error(f"Failed to upload metadata to Cloudinary: {cloudinary_error}")
-#         #     # Continue with local storage even if Cloudinary fails
-#         
-#         logger.info(f"✅ Updated metadata for {user_type} in room {room_id}: {chunk_name} ({start_time}-{end_time}s)")
-#         
-#     except Exception as e:
-#         logger.error(f"Failed to update metadata file for room {room_id}, user {user_type}: {str(e)}")
-#         # Don't raise exception to avoid breaking the upload process
+# Caps concurrent R2 transfers (and the worker threads they occupy); the
+# request body is already parsed and spooled before the handler runs
+_upload_semaphore = asyncio.Semaphore(settings.MAX_INFLIGHT_UPLOADS)
 
 
-async def update_metadata_file_r2(room_id: str, user_type: str, chunk_name: str, start_time: float, end_time: float):
+def chunk_timing_metadata(chunk_index: int, start_time: float, end_time: float) -> Dict[str, str]:
     """
-    Update metadata file in R2 storage for later reconstruction of the recording.
+    Build the object metadata that records a chunk's position and timing.
     
-    This function maintains a simple text file that tracks all uploaded chunks
-    with their timing information, enabling proper reconstruction of the final video.
+    Stored on the chunk object itself (x-amz-meta-*), so reconstructing a
+    recording needs no separate metadata file.
+    
+    Args:
+        chunk_index: Index of the chunk for ordering
+        start_time: Start time of the chunk in seconds
+        end_time: End time of the chunk in seconds
+        
+    Returns:
+        Dict of metadata keys to string values
+    """
+    return {
+        "chunk-index": str(chunk_index),
+        "start-time": str(start_time),
+        "end-time": str(end_time)
+    }
+
+
+def update_metadata_file_r2(room_id: str, user_type: str, chunk_name: str, start_time: float, end_time: float):
+    """
+    Record chunk timing in R2 storage for later reconstruction of the recording.
+    
+    The line is queued in the in-process metadata buffer, which the
+    background flusher writes to the room's metadata segments in R2 in
+    batches, so the upload request never waits on metadata I/O.
     
     Args:
         room_id: Room ID of the recording
@@ -132,29 +80,34 @@ async def update_metadata_file_r2(room_id: str, user_type: str, chunk_name: str,
         start_time: Start time of the chunk in seconds
         end_time: End time of the chunk in seconds
     """
-    try:
-        from app.services.r2_storage import r2_storage
-        
-        # Get existing metadata content from R2
-        existing_txt = await r2_storage.download_metadata(room_id, user_type)
-        if existing_txt is None:
-            existing_txt = ""
-            logger.info(f"No existing metadata file in R2, creating new one")
-        
-        # Append new chunk info in CSV format: chunkName,startTime,endTime
-        updated_txt = existing_txt + f"{chunk_name},{start_time},{end_time}\n"
-        
-        # Upload updated metadata to R2
-        object_key = await r2_storage.upload_metadata(updated_txt, room_id, user_type)
+    # Chunk info in CSV format: chunkName,startTime,endTime
+    buffer_metadata_line(room_id, user_type, f"{chunk_name},{start_time},{end_time}\n")
+
+
+async def issue_guest_token(room_id: str, service: RecordingService) -> GuestTokenResponse:
+    """
+    Issue a guest token for a room, shared by both guest-token endpoints.
+    
+    Args:
+        room_id: Room ID to generate token for
+        service: Recording service
         
-        if object_key:
-            logger.info(f"✅ Updated metadata in R2 for {user_type} in room {room_id}: {chunk_name} ({start_time}-{end_time}s)")
-        else:
-            logger.error(f"Failed to upload metadata to R2 for room {room_id}, user {user_type}")
+    Returns:
+        GuestTokenResponse: Generated token
         
-    except Exception as e:
-        logger.error(f"Failed to update metadata file in R2 for room {room_id}, user {user_type}: {str(e)}")
-        # Don't raise exception to avoid breaking the upload process
+    Raises:
+        HTTPException: If the recording does not exist
+    """
+    # Returns None when the room does not exist
+    token = await service.generate_guest_token(room_id)
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording not found"
+        )
+    
+    logger.info("Generated guest token for room %s", room_id)
+    return GuestTokenResponse(token=token)
 
 
 @router.post(
@@ -166,7 +119,7 @@ async def update_metadata_file_r2(room_id: str, user_type: str, chunk_name: str,
 )
 async def create_recording(
     recording_data: RecordingCreateRequest,
-    db: AsyncSession = Depends(get_db)
+    service: RecordingService = Depends(get_recording_service)
 ):
     """
     Create a new recording session.
@@ -178,106 +131,20 @@ async def create_recording(
     
     Args:
         recording_data: Details for the new recording including user_id
-        db: Database session dependency
+        service: Recording service dependency
         
     Returns:
         RecordingResponse: Details of the created recording
-        
-    Raises:
-        HTTPException: If recording creation fails
-    """
-    try:
-        service = RecordingService(db)
-        recording = await service.create_recording(recording_data)
-        
-        response = RecordingResponse(
-            id=str(recording.id),
-            room_id=recording.room_id,
-            host_user_id=recording.host_user_id,  # Correct field name
-            title=recording.title,
-            description=recording.description,  # Required field
-            status=recording.status,
-            created_at=recording.created_at,
-            started_at=recording.started_at,  # Required field
-            ended_at=recording.ended_at,  # Required field
-            processed_at=recording.processed_at,  # Required field
-            video_url=recording.video_url,
-            thumbnail_url=recording.thumbnail_url,  # Required field
-            duration_seconds=recording.duration_seconds,  # Required field
-            max_participants=recording.max_participants,  # Required field
-            processing_attempts=recording.processing_attempts  # Required field
-        )
-        
-        logger.info(f"Created recording {response.id} with room_id {response.room_id} for user {recording_data.user_id}")
-        return response
-        
-    except Exception as e:
-        logger.error(f"Failed to create recording: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create recording"
-        )
-
-
-@router.get(
-    "/{room_id}",
-    response_model=RecordingResponse,
-    summary="Get recording by room ID",
-    description="Retrieve a specific recording by its room ID"
-)
-async def get_recording(
-    room_id: str,
-    db: AsyncSession = Depends(get_db)
-):
     """
-    Get a recording by room ID.
+    recording = await service.create_recording(recording_data)
     
-    Args:
-        room_id: Room ID of the recording
-        db: Database session dependency
-        
-    Returns:
-        RecordingResponse: Recording details
-        
-    Raises:
-        HTTPException: If recording not found
-    """
-    try:
-        service = RecordingService(db)
-        recording = await service.get_recording_by_room_id(room_id)
-        
-        if not recording:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Recording not found"
-            )
-        
-        return RecordingResponse(
-            id=str(recording.id),
-            room_id=recording.room_id,
-            host_user_id=recording.host_user_id,
-            title=recording.title,
-            description=recording.description,
-            status=recording.status,
-            created_at=recording.created_at,
-            started_at=recording.started_at,
-            ended_at=recording.ended_at,
-            processed_at=recording.processed_at,
-            video_url=recording.video_url,
-            thumbnail_url=recording.thumbnail_url,
-            duration_seconds=recording.duration_seconds,
-            max_participants=recording.max_participants,
-            processing_attempts=recording.processing_attempts
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get recording {room_id}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve recording"
-        )
+    response = RecordingResponse.model_validate(recording)
+    
+    logger.info(
+        "Created recording %s with room_id %s for user %s",
+        response.id, response.room_id, recording_data.user_id
+    )
+    return response
 
 
 @router.get(
@@ -289,7 +156,7 @@ async def get_recording(
 async def get_user_recordings(
     user_id: str,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db)
+    service: RecordingService = Depends(get_recording_service)
 ):
     """
     Get all recordings for a specific user.
@@ -297,42 +164,14 @@ async def get_user_recordings(
     Args:
         user_id: ID of the user
         limit: Maximum number of recordings to return (default 50)
-        db: Database session dependency
+        service: Recording service dependency
         
     Returns:
         List[RecordingResponse]: List of user's recordings
     """
-    try:
-        service = RecordingService(db)
-        recordings = await service.get_user_recordings(user_id, limit)
-        
-        return [
-            RecordingResponse(
-                id=str(recording.id),
-                room_id=recording.room_id,
-                host_user_id=recording.host_user_id,  # Correct field name
-                title=recording.title,
-                description=recording.description,  # Required field
-                status=recording.status,
-                created_at=recording.created_at,
-                started_at=recording.started_at,  # Required field
-                ended_at=recording.ended_at,  # Required field
-                processed_at=recording.processed_at,  # Required field
-                video_url=recording.video_url,
-                thumbnail_url=recording.thumbnail_url,  # Required field
-                duration_seconds=recording.duration_seconds,  # Required field
-                max_participants=recording.max_participants,  # Required field
-                processing_attempts=recording.processing_attempts  # Required field
-            )
-            for recording in recordings
-        ]
-        
-    except Exception as e:
-        logger.error(f"Failed to get recordings for user {user_id}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve user recordings"
-        )
+    recordings = await service.get_user_recordings(user_id, limit)
+    
+    return [RecordingResponse.model_validate(recording) for recording in recordings]
 
 
 @router.post(
@@ -343,45 +182,22 @@ async def get_user_recordings(
 )
 async def generate_guest_token(
     room_id: str,
-    db: AsyncSession = Depends(get_db)
+    service: RecordingService = Depends(get_recording_service)
 ):
     """
     Generate a guest token for a recording room.
     
     Args:
         room_id: Room ID to generate token for
-        db: Database session dependency
+        service: Recording service dependency
         
     Returns:
         GuestTokenResponse: Generated token
         
     Raises:
-        HTTPException: If token generation fails
+        HTTPException: If the recording does not exist
     """
-    try:
-        service = RecordingService(db)
-        
-        # Verify recording exists
-        recording = await service.get_recording_by_room_id(room_id)
-        if not recording:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Recording not found"
-            )
-        
-        token = await service.generate_guest_token(room_id)
-        
-        logger.info(f"Generated guest token for room {room_id}")
-        return GuestTokenResponse(token=token)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to generate guest token for room {room_id}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate guest token"
-        )
+    return await issue_guest_token(room_id, service)
 
 
 @router.get(
@@ -390,149 +206,79 @@ async def generate_guest_token(
     summary="Get upload URL",
     description="Generate a pre-signed URL for uploading recording chunks"
 )
-async def get_upload_url():
+async def get_upload_url(
+    room_id: str = Query(..., pattern=ROOM_ID_PATTERN),
+    user_type: UserType = Query(...),
+    chunk_name: str = Query(..., pattern=CHUNK_NAME_PATTERN),
+    chunk_index: Optional[int] = Query(None, ge=0),
+    start_time: Optional[float] = Query(None, ge=0),
+    end_time: Optional[float] = Query(None, ge=0)
+):
     """
-    Generate a pre-signed URL for uploading recording chunks.
+    Generate a pre-signed URL for uploading a recording chunk.
+    
+    The client PUTs the chunk straight to R2 with this URL, so the chunk
+    bytes never pass through the API. The object key matches the layout
+    used by /upload-chunk, so the video processing task picks the chunk up
+    the same way. When chunk_index is given, the chunk's timing is signed
+    into the URL as object metadata, and the returned headers must be sent
+    with the PUT.
     
-    Note: This is a placeholder implementation. In production, you would
-    integrate with your cloud storage provider (S3, GCS, etc.) to generate
-    actual pre-signed URLs.
+    Args:
+        room_id: Room ID for the recording
+        user_type: Type of user ("host" or "guest")
+        chunk_name: Name of the chunk file
+        chunk_index: Index of the chunk for ordering (optional)
+        start_time: Start time of the chunk in seconds (optional)
+        end_time: End time of the chunk in seconds (optional)
     
     Returns:
         UploadUrlResponse: Upload URL and related information
     """
-    try:
-        # TODO: Implement actual cloud storage integration
-        # For now, return a placeholder response
-        upload_id = str(uuid.uuid4())
-        
-        # In production, this would be a real pre-signed URL from your cloud provider
-        upload_url = f"/upload-chunk"  # This will be handled by the chunk upload endpoint
-        
-        return UploadUrlResponse(
-            upload_url=upload_url,
-            upload_id=upload_id,
-            expires_in=3600  # 1 hour
-        )
-        
-    except Exception as e:
-        logger.error(f"Failed to generate upload URL: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate upload URL"
-        )
-
-
-# COMMENTED OUT - OLD LOCAL STORAGE METHOD
-# @router.post(
-#     "/upload-chunk",
-#     summary="Upload recording chunk",
-#     description="Upload a recording chunk file"
-# )
-# async def upload_chunk(
-#     file: UploadFile = File(...),
-#     room_id: str = Form(...),
-#     user_type: str = Form(...),  # "host" or "guest"
-#     chunk_index: int = Form(...),
-#     start_time: float = Form(None),  # Optional for backwards compatibility
-#     end_time: float = Form(None),    # Optional for backwards compatibility
-# ):
-#     """
-#     Upload a recording chunk.
-#     
-#     This endpoint receives recording chunks from the frontend and stores them
-#     locally (and optionally to Cloudinary).
-#     
-#     Args:
-#         file: The uploaded chunk file
-#         room_id: Room ID for the recording
-#         user_type: Type of user ("host" or "guest")
-#         chunk_index: Index of the chunk for ordering
-#         
-#     Returns:
-#         Success message
-#         
-#     Raises:
-#         HTTPException: If upload fails
-#     """
-#     try:
-#         # Get the original filename from the uploaded file
-#         chunk_name = file.filename or f"chunk_{chunk_index}.webm"
-#         
-#         # Create uploads directory if it doesn't exist
-#         upload_dir = f"uploads/recordings/{room_id}/{user_type}"
-#         os.makedirs(upload_dir, exist_ok=True)
-#         
-#         # Save file locally
-#         file_path = os.path.join(upload_dir, chunk_name)
-#         content = await file.read()
-#         
-#         with open(file_path, "wb") as buffer:
-#             buffer.write(content)
-#         
-#         logger.info(f"✅ Chunk {chunk_name} saved locally for room {room_id}, user_type {user_type}")
-#         
-#         # TODO: Cloudinary upload (commented for now)
-#         # cloudinary_chunk_path = f"recordings/{room_id}/{user_type}/{chunk_name}"
-#         # try:
-#         #     import cloudinary
-#         #     import cloudinary.uploader
-#         #     
-#         #     # Upload to Cloudinary
-#         #     result = cloudinary.uploader.upload(
-#         #         content,
-#         #         resource_type="video",
-#         #         public_id=cloudinary_chunk_path,
-#         #         use_filename=True,
-#         #         unique_filename=False,
-#         #         overwrite=True,
-#         #         timeout=60000
-#         #     )
-#         #     logger.info(f"✅ Chunk {chunk_name} uploaded to Cloudinary: {result.get('url')}")
-#         # except Exception as cloudinary_error:
-#         #     logger.error(f"Cloudinary upload failed for {chunk_name}: {cloudinary_error}")
-#         #     # Continue with local storage even if Cloudinary fails
-#         
-#         # Update metadata file for later reconstruction
-#         # Calculate start/end times if not provided (based on chunk index)
-#         if start_time is None:
-#             start_time = chunk_index * 1.0  # Assume 1-second chunks
-#         if end_time is None:
-#             end_time = (chunk_index + 1) * 1.0
-#             
-#         await update_metadata_file(room_id, user_type, chunk_name, start_time, end_time)
-#         
-#         return {
-#             "message": "Chunk uploaded successfully",
-#             "filename": chunk_name,
-#             "size": len(content),
-#             "chunk_index": chunk_index,
-#             "start_time": start_time,
-#             "end_time": end_time,
-#             "local_path": file_path
-#             # "cloudinary_url": result.get('url') if cloudinary upload enabled
-#         }
-#         
-#     except Exception as e:
-#         logger.error(f"Failed to upload chunk for room {room_id}: {str(e)}")
-#         raise HTTPException(
-#             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-#             detail="Failed to upload chunk"
-#         )
+    from app.services.r2_storage import r2_storage
+    
+    upload_id = secrets.token_hex(16)
+    expires_in = settings.UPLOAD_URL_EXPIRATION_MINUTES * 60
+    headers = {"Content-Type": "video/webm"}
+    
+    metadata = None
+    if chunk_index is not None:
+        # Same defaults as /upload-chunk (1-second chunks)
+        if start_time is None:
+            start_time = chunk_index * 1.0
+        if end_time is None:
+            end_time = (chunk_index + 1) * 1.0
+        metadata = chunk_timing_metadata(chunk_index, start_time, end_time)
+        headers.update({f"x-amz-meta-{key}": value for key, value in metadata.items()})
+    
+    upload_url = r2_storage.generate_chunk_upload_url(
+        room_id, user_type, chunk_name, expires_in, metadata=metadata
+    )
+    
+    return UploadUrlResponse(
+        upload_url=upload_url,
+        upload_id=upload_id,
+        expires_in=expires_in,
+        headers=headers
+    )
 
 
 @router.post(
     "/upload-chunk",
     summary="Upload recording chunk to R2",
-    description="Upload a recording chunk file to Cloudflare R2 storage"
+    description=(
+        "Upload a recording chunk file to Cloudflare R2 storage. Deprecated: "
+        "new clients should PUT chunks directly to R2 using /upload-url"
+    ),
+    deprecated=True
 )
 async def upload_chunk(
     file: UploadFile = File(...),
-    room_id: str = Form(...),
-    user_type: str = Form(...),  # "host" or "guest"
-    chunk_index: int = Form(...),
-    start_time: float = Form(None),  # Optional for backwards compatibility
-    end_time: float = Form(None),    # Optional for backwards compatibility
+    room_id: str = Form(..., pattern=ROOM_ID_PATTERN),
+    user_type: UserType = Form(...),
+    chunk_index: int = Form(..., ge=0),
+    start_time: Optional[float] = Form(None, ge=0),  # Optional for backwards compatibility
+    end_time: Optional[float] = Form(None, ge=0),    # Optional for backwards compatibility
 ):
     """
     Upload a recording chunk to Cloudflare R2 storage.
@@ -540,6 +286,9 @@ async def upload_chunk(
     This endpoint receives recording chunks from the frontend and stores them
     in Cloudflare R2 storage under the riversideuploads bucket.
     
+    Kept for existing clients; relaying the bytes through the API doubles
+    bandwidth and CPU compared with a direct PUT to a /upload-url URL.
+    
     Args:
         file: The uploaded chunk file
         room_id: Room ID for the recording
@@ -552,56 +301,65 @@ async def upload_chunk(
         Success message with R2 storage details
         
     Raises:
-        HTTPException: If upload fails
+        HTTPException: If the chunk is too large, its file name is invalid,
+            or the upload fails
     """
-    try:
-        from app.services.r2_storage import r2_storage
-        
-        # Get the original filename from the uploaded file
-        chunk_name = file.filename or f"chunk_{chunk_index}.webm"
-        
-        # Read file content
-        content = await file.read()
-        
-        # Upload chunk to R2
-        object_key = await r2_storage.upload_chunk(content, room_id, user_type, chunk_name)
-        
-        if not object_key:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to upload chunk to R2 storage"
-            )
-        
-        logger.info(f"✅ Chunk {chunk_name} uploaded to R2 for room {room_id}, user_type {user_type}")
-        
-        # Update metadata file for later reconstruction
-        # Calculate start/end times if not provided (based on chunk index)
-        if start_time is None:
-            start_time = chunk_index * 1.0  # Assume 1-second chunks
-        if end_time is None:
-            end_time = (chunk_index + 1) * 1.0
-            
-        await update_metadata_file_r2(room_id, user_type, chunk_name, start_time, end_time)
-        
-        return {
-            "message": "Chunk uploaded successfully to R2",
-            "filename": chunk_name,
-            "size": len(content),
-            "chunk_index": chunk_index,
-            "start_time": start_time,
-            "end_time": end_time,
-            "r2_object_key": object_key,
-            "storage_type": "cloudflare_r2"
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to upload chunk for room {room_id}: {str(e)}")
+    # Bodies sent without a Content-Length get past limit_request_body; this
+    # runs after the form is spooled and only keeps the chunk from reaching R2
+    if file.size is not None and file.size > settings.MAX_CHUNK_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Chunk exceeds {settings.MAX_CHUNK_BYTES} bytes"
+        )
+    
+    # Get the original filename from the uploaded file
+    chunk_name = file.filename or f"chunk_{chunk_index}.webm"
+    if not re.fullmatch(CHUNK_NAME_PATTERN, chunk_name):
+        raise HTTPException(
+            status_code=422,
+            detail="Invalid chunk file name"
+        )
+    
+    from app.services.r2_storage import r2_storage
+    
+    # Calculate start/end times if not provided (based on chunk index)
+    if start_time is None:
+        start_time = chunk_index * 1.0  # Assume 1-second chunks
+    if end_time is None:
+        end_time = (chunk_index + 1) * 1.0
+    
+    # Stream the spooled upload straight to R2 without reading it into memory;
+    # the chunk's timing travels with it as object metadata
+    async with _upload_semaphore:
+        object_key, skipped = await r2_storage.upload_chunk(
+            file.file, room_id, user_type, chunk_name,
+            metadata=chunk_timing_metadata(chunk_index, start_time, end_time),
+            size=file.size
+        )
+    
+    if not object_key:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to upload chunk"
+            detail="Failed to upload chunk to R2 storage"
         )
+    
+    logger.info("✅ Chunk %s uploaded to R2 for room %s, user_type %s", chunk_name, room_id, user_type)
+    
+    # A duplicate's metadata line was already written with the original upload
+    if settings.RECORDING_METADATA_CSV_ENABLED and not skipped:
+        update_metadata_file_r2(room_id, user_type, chunk_name, start_time, end_time)
+    
+    return {
+        "message": "Chunk uploaded successfully to R2",
+        "filename": chunk_name,
+        "size": file.size,
+        "chunk_index": chunk_index,
+        "start_time": start_time,
+        "end_time": end_time,
+        "r2_object_key": object_key,
+        "duplicate": skipped,
+        "storage_type": "cloudflare_r2"
+    }
 
 
 @router.post(
@@ -612,7 +370,7 @@ async def upload_chunk(
 async def update_recording_title(
     room_id: str = Form(...),
     title: str = Form(...),
-    db: AsyncSession = Depends(get_db)
+    service: RecordingService = Depends(get_recording_service)
 ):
     """
     Update the title of a recording.
@@ -620,35 +378,24 @@ async def update_recording_title(
     Args:
         room_id: Room ID of the recording
         title: New title
-        db: Database session dependency
+        service: Recording service dependency
         
     Returns:
         Success message
         
     Raises:
-        HTTPException: If update fails
+        HTTPException: If the recording does not exist
     """
-    try:
-        service = RecordingService(db)
-        success = await service.update_recording_title(room_id, title)
-        
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Recording not found"
-            )
-        
-        logger.info(f"Updated title for room {room_id} to: {title}")
-        return {"message": "Title updated successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to update title for room {room_id}: {str(e)}")
+    success = await service.update_recording_title(room_id, title)
+    
+    if not success:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update recording title"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording not found"
         )
+    
+    logger.info("Updated title for room %s to: %s", room_id, title)
+    return {"message": "Title updated successfully"}
 
 
 @router.get(
@@ -660,22 +407,17 @@ async def get_turn_credentials():
     """
     Get TURN server credentials for WebRTC connections.
     
+    The payload only depends on settings, so it is serialized once at
+    import and clients may cache it briefly.
+    
     Returns:
         TURN server configuration including URL, username, and credential
     """
-    try:
-        return {
-            "urls": f"turn:{settings.TURN_SERVER_URL}",
-            "username": settings.TURN_SERVER_USERNAME,
-            "credential": settings.TURN_SERVER_CREDENTIAL
-        }
-        
-    except Exception as e:
-        logger.error(f"Failed to get TURN credentials: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get TURN credentials"
-        )
+    return Response(
+        content=TURN_CREDENTIALS_BODY,
+        media_type="application/json",
+        headers={"Cache-Control": TURN_CREDENTIALS_CACHE_CONTROL}
+    )
 
 
 @router.post(
@@ -685,48 +427,53 @@ async def get_turn_credentials():
     description="Generate a guest token for room access (matches Node.js endpoint path)"
 )
 async def generate_token(
-    request: dict,
-    db: AsyncSession = Depends(get_db)
+    request: GenerateTokenRequest,
+    service: RecordingService = Depends(get_recording_service)
 ):
     """
     Generate a guest token for room access.
     Alternative endpoint that matches the Node.js implementation path.
     
     Args:
-        request: Request containing roomId
-        db: Database session dependency
+        request: Request body containing roomId
+        service: Recording service dependency
         
     Returns:
         GuestTokenResponse: Generated token
     """
-    try:
-        room_id = request.get('roomId')
-        if not room_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="roomId is required"
-            )
-        
-        service = RecordingService(db)
-        
-        # Verify recording exists
-        recording = await service.get_recording_by_room_id(room_id)
-        if not recording:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Recording not found"
-            )
-        
-        token = await service.generate_guest_token(room_id)
+    return await issue_guest_token(request.room_id, service)
+
+
+# Registered last so the catch-all path does not shadow static GET routes
+@router.get(
+    "/{room_id}",
+    response_model=RecordingResponse,
+    summary="Get recording by room ID",
+    description="Retrieve a specific recording by its room ID"
+)
+async def get_recording(
+    room_id: str,
+    service: RecordingService = Depends(get_recording_service)
+):
+    """
+    Get a recording by room ID.
+    
+    Args:
+        room_id: Room ID of the recording
+        service: Recording service dependency
         
-        logger.info(f"Generated guest token for room {room_id}")
-        return GuestTokenResponse(token=token)
+    Returns:
+        RecordingResponse: Recording details
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to generate token: {str(e)}")
+    Raises:
+        HTTPException: If recording not found
+    """
+    recording = await service.get_recording_by_room_id(room_id)
+    
+    if not recording:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate guest token"
-        ) 
\ No newline at end of file
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recording not found"
+        )
+    
+    return RecordingResponse.model_validate(recording)
@@ -6,9 +6,15 @@ import logging
 from datetime import datetime
 from typing import Dict, Optional
 import asyncio
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.tasks.video_processing import process_video
+from app.tasks.video_processing import (
+    process_video,
+    PROCESSING_LOCK_PREFIX,
+    PROCESSING_LOCK_TTL_SECONDS
+)
 from app.core.config import settings
+from app.core.redis import get_redis
 
 logger = logging.getLogger(__name__)
 
@@ -202,6 +208,19 @@ async def recording_stopped(sid, data):
         # Notify all participants to stop recording
         await sio.emit('stop-rec', room=room_id)
         
+        # Enqueue processing once per room until the task finishes; every
+        # participant may report the stop. Fall through if Redis is down.
+        lock_key = f"{PROCESSING_LOCK_PREFIX}{room_id}"
+        try:
+            acquired = await get_redis().set(lock_key, "1", nx=True, ex=PROCESSING_LOCK_TTL_SECONDS)
+        except RedisError as e:
+            logger.warning(f"Processing lock check failed for room {room_id}: {str(e)}")
+            acquired = True
+        
+        if not acquired:
+            logger.info(f"Video processing already scheduled for room: {room_id}")
+            return
+        
         # Schedule video processing task (with 10 second delay like in Node.js)
         async def schedule_processing():
             await asyncio.sleep(10)  # 10 second delay
@@ -211,6 +230,10 @@ async def recording_stopped(sid, data):
                 logger.info(f"Video processing task {task.id} scheduled for room: {room_id}")
             except Exception as e:
                 logger.error(f"Error scheduling video processing for room {room_id}: {str(e)}")
+                try:
+                    await get_redis().delete(lock_key)
+                except RedisError:
+                    pass
                 await sio.emit('video-processing-error', {
                     'error': str(e)
                 }, room=room_id)
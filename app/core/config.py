@@ -107,11 +107,41 @@ class Settings(BaseSettings):
         description="How long upload URLs remain valid (in minutes)"
     )
     
+    # Worker threads for blocking I/O offloaded with asyncio.to_thread
+    BLOCKING_IO_MAX_WORKERS: int = Field(
+        default=32,
+        description="Size of the default thread pool used for blocking storage calls"
+    )
+    
+    # Limit on chunk transfers to R2 relayed through the API; does not bound
+    # request bodies, which are spooled before the handler runs
+    MAX_INFLIGHT_UPLOADS: int = Field(
+        default=16,
+        description="Maximum concurrent chunk transfers to R2 (and threads used) per process"
+    )
+    
+    # Largest chunk accepted by /upload-chunk
+    MAX_CHUNK_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Chunk uploads larger than this are rejected with 413"
+    )
+    
+    # Chunk timing is stored as object metadata on each chunk; the per-room
+    # CSV metadata segments are only written when this is enabled
+    RECORDING_METADATA_CSV_ENABLED: bool = Field(
+        default=False,
+        description="Also write chunk timing to the legacy CSV metadata segments"
+    )
+    
     # Redis configuration for Celery
     REDIS_URL: str = Field(
         default="redis://localhost:6379/0",
         description="Redis URL for Celery broker and result backend"
     )
+    REDIS_MAX_CONNECTIONS: int = Field(
+        default=50,
+        description="Connection pool size of the shared application Redis client"
+    )
     
     # Security
     SECRET_KEY: str = secrets.token_urlsafe(32)
@@ -141,6 +171,15 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "fastapi_template"
     DATABASE_ECHO: bool = False
+    
+    # Connection pool (ignored when DATABASE_USE_NULL_POOL is set)
+    DATABASE_POOL_SIZE: int = 25
+    DATABASE_MAX_OVERFLOW: int = 25
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    # How long a request waits for a free connection before failing
+    DATABASE_POOL_TIMEOUT_SECONDS: int = 30
+    # Disable app-side pooling when running behind PgBouncer in transaction mode
+    DATABASE_USE_NULL_POOL: bool = False
 
     TURN_SERVER_URL: str = "relay1.expressturn.com:3480"
     TURN_SERVER_USERNAME: str = "000000002066064322"
@@ -170,6 +209,9 @@ class Settings(BaseSettings):
     # Cache
     CACHE_TTL: int = 300  # 5 minutes
     
+    # Response compression (bodies smaller than this are sent as-is)
+    GZIP_MINIMUM_SIZE: int = 512
+    
     # Model configuration
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -9,14 +9,29 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker
 )
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
+# Pool configuration: either an external pooler (PgBouncer) or an
+# explicitly sized in-process pool
+if settings.DATABASE_USE_NULL_POOL:
+    pool_options = {"poolclass": NullPool}
+else:
+    pool_options = {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+    }
+
 # Create SQLAlchemy async engine
 engine = create_async_engine(
     settings.SQLALCHEMY_DATABASE_URI,
     echo=settings.DATABASE_ECHO,
     future=True,
+    **pool_options,
 )
 
 # Create async session factory
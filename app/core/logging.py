@@ -16,7 +16,9 @@ def configure_logging() -> None:
     # Configure structlog
     structlog.configure(
         processors=[
-            structlog.processors.TimeStamper(fmt="iso"),
+            # Drop disabled events before any formatting work is done
+            structlog.stdlib.filter_by_level,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
             structlog.stdlib.add_log_level,
             structlog.stdlib.add_logger_name,
             structlog.processors.StackInfoRenderer(),
@@ -61,6 +63,10 @@ def configure_logging() -> None:
     logging.getLogger("fastapi").setLevel(logging.INFO)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
+    # Liveness probes and metric scrapes are high-frequency and low-value
+    logging.getLogger("app.api.endpoints.health").setLevel(logging.WARNING)
+    logging.getLogger("app.api.endpoints.metrics").setLevel(logging.WARNING)
+
     # Log startup message
     logger = structlog.get_logger(__name__)
     logger.info(
@@ -0,0 +1,41 @@
+"""
+Shared Redis client for application-level caching.
+"""
+from typing import Optional
+import logging
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Process-wide client; its connection pool is shared by every caller
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Get the shared Redis client, creating it on first use.
+
+    Returns:
+        redis.Redis: Async Redis client backed by a connection pool
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS
+        )
+        logger.info("Redis client initialized")
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client and release its connections."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+        logger.info("Redis client closed")
@@ -3,6 +3,7 @@ Main FastAPI application factory with improved WebSocket integration.
 """
 from fastapi import FastAPI, Request, Response, WebSocket, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.openapi.docs import get_swagger_ui_html
@@ -12,15 +13,27 @@ import structlog
 import asyncio
 import signal
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 from datetime import datetime, timedelta
 
 from app.api.router import api_router
+from app.api.endpoints.metrics import (
+    ENDPOINT_LABEL_SCOPE_KEY,
+    prime_request_metrics,
+    request_count_child,
+    request_metric_children,
+    resolve_endpoint_label,
+    sample_system_metrics,
+    track_in_progress,
+)
 from app.api.socketio_server import sio
 from app.core.config import settings, get_settings
 from app.core.logging import configure_logging
 from app.core.database import get_db
+from app.core.redis import close_redis
+from app.services.metadata_buffer import run_metadata_flusher
 import socketio
 
 # Create a logger for this module
@@ -32,8 +45,10 @@ shutdown_event = asyncio.Event()
 # Track active requests
 active_requests: Dict[str, Any] = {}
 
-# Global task handle for cleanup
+# Global task handles for background loops
 cleanup_task = None
+system_metrics_task = None
+metadata_flusher_task = None
 
 async def periodic_cleanup():
     """Background task to cleanup old recordings periodically."""
@@ -61,7 +76,7 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for the FastAPI application.
     Handles startup and shutdown events.
     """
-    global cleanup_task
+    global cleanup_task, system_metrics_task, metadata_flusher_task
     
     # Startup
     logger.info("🚀 Starting Riverside backend...")
@@ -69,6 +84,11 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug mode: {settings.DEBUG}")
     logger.info(f"CORS origins: {settings.ALLOWED_ORIGINS}")
     
+    # Size the executor that asyncio.to_thread uses for blocking storage I/O
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.BLOCKING_IO_MAX_WORKERS)
+    )
+    
     # Register signal handlers
     for sig in (signal.SIGTERM, signal.SIGINT):
         asyncio.get_event_loop().add_signal_handler(
@@ -80,6 +100,16 @@ async def lifespan(app: FastAPI):
     cleanup_task = asyncio.create_task(periodic_cleanup())
     logger.info("✅ Periodic cleanup task started")
     
+    # Start background system metrics sampler
+    system_metrics_task = asyncio.create_task(sample_system_metrics())
+    logger.info("✅ System metrics sampler started")
+    
+    # Start background flusher for buffered chunk metadata; lines are only
+    # buffered when the legacy CSV metadata is enabled
+    if settings.RECORDING_METADATA_CSV_ENABLED:
+        metadata_flusher_task = asyncio.create_task(run_metadata_flusher())
+        logger.info("✅ Metadata flusher started")
+    
     yield
     
     # Shutdown
@@ -93,6 +123,25 @@ async def lifespan(app: FastAPI):
             await cleanup_task
         except asyncio.CancelledError:
             logger.info("✅ Cleanup task cancelled")
+    
+    # Cancel system metrics sampler
+    if system_metrics_task:
+        system_metrics_task.cancel()
+        try:
+            await system_metrics_task
+        except asyncio.CancelledError:
+            logger.info("✅ System metrics sampler cancelled")
+    
+    # Cancel metadata flusher (drains pending lines before exiting)
+    if metadata_flusher_task:
+        metadata_flusher_task.cancel()
+        try:
+            await metadata_flusher_task
+        except asyncio.CancelledError:
+            logger.info("✅ Metadata flusher cancelled")
+    
+    # Release shared Redis connections
+    await close_redis()
 
 async def handle_shutdown(sig: signal.Signals):
     """
@@ -154,9 +203,28 @@ def create_application() -> FastAPI:
         docs_url=None,  # Disable automatic docs
         redoc_url=None,  # Disable automatic redoc
         openapi_url="/openapi.json",
+        dependencies=[Depends(track_in_progress)],
         lifespan=lifespan
     )
     
+    # Reject oversized chunk uploads from the Content-Length header before the
+    # body is read. Registered first so CORS and track_requests both wrap it and
+    # the 413 carries CORS headers and a request ID. Bodies sent with chunked
+    # transfer encoding have no Content-Length; upload_chunk re-checks the size
+    # once the form is parsed.
+    upload_chunk_path = f"{settings.API_V1_STR}/recordings/upload-chunk"
+    
+    @application.middleware("http")
+    async def limit_request_body(request: Request, call_next):
+        if request.url.path == upload_chunk_path:
+            content_length = request.headers.get("content-length", "")
+            if content_length.isdigit() and int(content_length) > settings.MAX_CHUNK_BYTES:
+                return JSONResponse(
+                    status_code=413,
+                    content={"detail": f"Request body exceeds {settings.MAX_CHUNK_BYTES} bytes"}
+                )
+        return await call_next(request)
+    
     # Add CORS middleware
     application.add_middleware(
         CORSMiddleware,
@@ -166,6 +234,9 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Compress JSON responses (recording lists, metrics) for slow client links
+    application.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+    
     # Include API router
     application.include_router(api_router, prefix=settings.API_V1_STR)
     
@@ -226,8 +297,11 @@ def create_application() -> FastAPI:
             "method": request.method
         }
         
+        status_code = 500
+        
         try:
             response = await call_next(request)
+            status_code = response.status_code
             
             # Add request ID to response headers
             response.headers["X-Request-ID"] = request_id
@@ -247,6 +321,17 @@ def create_application() -> FastAPI:
                 headers={"X-Request-ID": request_id}
             )
         finally:
+            # Record Prometheus request metrics under the route template
+            # already resolved by track_in_progress (unmatched paths never
+            # reach it)
+            endpoint = (
+                request.scope.get(ENDPOINT_LABEL_SCOPE_KEY)
+                or resolve_endpoint_label(request)
+            )
+            _, latency = request_metric_children(request.method, endpoint)
+            latency.observe(time.time() - start_time)
+            request_count_child(request.method, endpoint, status_code).inc()
+            
             # Track request end
             if request_id in active_requests:
                 duration = time.time() - start_time
@@ -288,6 +373,9 @@ def create_application() -> FastAPI:
             headers={"X-Request-ID": request_id}
         )
     
+    # Every route is registered by now
+    prime_request_metrics(application.routes)
+    
     logger.info("Application startup complete")
     
     # Mount Socket.IO at /socket.io/ path (default)
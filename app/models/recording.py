@@ -1,7 +1,7 @@
 """
 Recording models for the new Socket.IO + Celery architecture.
 """
-from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -29,8 +29,8 @@ class Recording(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     room_id = Column(String(50), unique=True, nullable=False, index=True)
     
-    # User who created the recording
-    host_user_id = Column(String(100), nullable=False, index=True)
+    # User who created the recording (indexed together with created_at below)
+    host_user_id = Column(String(100), nullable=False)
     
     # Recording metadata
     title = Column(String(255), nullable=True)
@@ -69,6 +69,11 @@ class Recording(Base):
     guest_tokens = relationship("GuestToken", back_populates="recording", cascade="all, delete-orphan")
     recording_chunks = relationship("RecordingChunk", back_populates="recording", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Serves "recordings for a user, newest first" without a sort step
+        Index("ix_recordings_host_user_id_created_at", host_user_id, created_at.desc()),
+    )
+
     def __repr__(self):
         return f"<Recording(id={self.id}, room_id={self.room_id}, status={self.status})>"
 
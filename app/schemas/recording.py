@@ -2,13 +2,22 @@
 Pydantic schemas for recording-related operations in the new architecture.
 """
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Dict, Literal, Optional, List
 from datetime import datetime
 from enum import Enum
 
 from app.schemas.base import BaseSchema
 from app.models.recording import RecordingStatus   # ← single source of truth
 
+# Participant roles; also the second segment of every chunk's storage key
+UserType = Literal["host", "guest"]
+
+# Room IDs and chunk names are interpolated into R2 object keys, so both are
+# restricted to formats that cannot contain "/" or escape their prefix.
+# Room IDs are generated as UUID4 strings.
+ROOM_ID_PATTERN = r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+CHUNK_NAME_PATTERN = r"^[\w.-]+\.(webm|mp4)$"
+
 # Request Schemas
 class RecordingCreateRequest(BaseModel):
     """Request model for creating a new recording session."""
@@ -65,6 +74,10 @@ class RecordingResponse(BaseSchema):
     max_participants: int
     processing_attempts: int
 
+    @validator('id', pre=True)
+    def stringify_id(cls, v):
+        return str(v)
+
 class RecordingCreateResponse(BaseModel):
     """Response model for creating a recording."""
     room_id: str = Field(..., description="Unique room identifier")
@@ -75,9 +88,9 @@ class RecordingCreateResponse(BaseModel):
 class GuestTokenResponse(BaseModel):
     """Response model for guest tokens."""
     token: str = Field(..., description="The guest token")
-    expires_at: datetime = Field(..., description="When the token expires")
-    join_url: str = Field(..., description="URL for guest to join with token")
-    uses_remaining: int = Field(..., description="Number of uses remaining")
+    expires_at: Optional[datetime] = Field(None, description="When the token expires")
+    join_url: Optional[str] = Field(None, description="URL for guest to join with token")
+    uses_remaining: Optional[int] = Field(None, description="Number of uses remaining")
 
 class RecordingUploadUrlResponse(BaseModel):
     """Response model for upload URL generation."""
@@ -158,11 +171,20 @@ class GuestTokenRequest(BaseModel):
     room_id: str = Field(..., description="Room ID to generate token for")
 
 
+class GenerateTokenRequest(BaseModel):
+    """Request model for /generatetoken (camelCase body, matches the Node.js API)."""
+    room_id: str = Field(..., alias="roomId", min_length=1, description="Room ID to generate token for")
+
+
 class UploadUrlResponse(BaseModel):
     """Response model for upload URL generation (simple version)."""
     upload_url: str = Field(..., description="Pre-signed upload URL")
     upload_id: str = Field(..., description="Unique upload identifier")
     expires_in: int = Field(..., description="URL expiration time in seconds")
+    headers: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Headers the client must send with the PUT request"
+    )
 
 
 # Task Schemas (for Celery)
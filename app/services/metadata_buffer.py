@@ -0,0 +1,86 @@
+"""
+In-process buffer that batches chunk metadata lines before writing them to R2.
+"""
+from collections import defaultdict
+from typing import DefaultDict, List, Tuple
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Flush at least this often (seconds) while lines are pending
+METADATA_FLUSH_INTERVAL = 0.5
+
+# Flush early once any single (room_id, user_type) buffer reaches this size
+METADATA_FLUSH_MAX_LINES = 32
+
+# Pending lines keyed by (room_id, user_type)
+_pending: DefaultDict[Tuple[str, str], List[str]] = defaultdict(list)
+_flush_requested = asyncio.Event()
+
+
+def buffer_metadata_line(room_id: str, user_type: str, line: str) -> None:
+    """
+    Queue a metadata line for the next flush.
+
+    Args:
+        room_id: Room ID of the recording
+        user_type: Type of user ("host" or "guest")
+        line: Newline-terminated metadata line
+    """
+    lines = _pending[(room_id, user_type)]
+    lines.append(line)
+    if len(lines) >= METADATA_FLUSH_MAX_LINES:
+        _flush_requested.set()
+
+
+async def flush_metadata() -> None:
+    """
+    Write every pending buffer to R2 as one metadata segment per room and user.
+
+    Lines whose segment fails to upload are put back at the front of their
+    buffer and retried on the next flush.
+    """
+    if not _pending:
+        return
+
+    from app.services.r2_storage import r2_storage
+
+    batches = list(_pending.items())
+    _pending.clear()
+
+    results = await asyncio.gather(*(
+        r2_storage.append_metadata("".join(lines), room_id, user_type)
+        for (room_id, user_type), lines in batches
+    ))
+
+    for ((room_id, user_type), lines), object_key in zip(batches, results):
+        if object_key:
+            logger.info(f"✅ Flushed {len(lines)} metadata lines for {user_type} in room {room_id}")
+        else:
+            logger.error(f"Failed to flush metadata for room {room_id}, user {user_type}; will retry")
+            _pending[(room_id, user_type)][:0] = lines
+
+
+async def run_metadata_flusher():
+    """
+    Background task that flushes buffered metadata on an interval.
+
+    Wakes every METADATA_FLUSH_INTERVAL seconds, or as soon as a buffer
+    fills up, and drains whatever is still pending when cancelled.
+    """
+    while True:
+        try:
+            try:
+                await asyncio.wait_for(_flush_requested.wait(), timeout=METADATA_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            _flush_requested.clear()
+
+            await flush_metadata()
+
+        except asyncio.CancelledError:
+            await flush_metadata()
+            raise
+        except Exception as e:
+            logger.error(f"Metadata flush failed: {str(e)}")
@@ -1,16 +1,42 @@
 """
 Cloudflare R2 Storage Service for handling video chunk uploads and downloads.
 """
+import asyncio
 import logging
+from collections import OrderedDict
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, BinaryIO, Tuple
 import tempfile
 import os
+import time
+import uuid
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Managed-transfer settings for chunk uploads: bodies above 8 MB go up as
+# 8 MB parts, with at most 4 parts in flight per upload
+CHUNK_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True
+)
+
+# How many recently uploaded chunk keys to remember for duplicate detection
+RECENT_CHUNK_KEYS_MAX = 10000
+
+# Every in-flight relayed upload may run max_concurrency part threads, on top
+# of the blocking calls made from the default thread pool; size the shared
+# client's connection pool so none of them wait for (or discard) a connection
+R2_MAX_POOL_CONNECTIONS = (
+    settings.MAX_INFLIGHT_UPLOADS * CHUNK_TRANSFER_CONFIG.max_concurrency
+    + settings.BLOCKING_IO_MAX_WORKERS
+)
+
 
 class R2StorageService:
     """Service for interacting with Cloudflare R2 storage."""
@@ -21,6 +47,9 @@ class R2StorageService:
         self.endpoint_url = settings.R2_ENDPOINT_URL
         self.public_url_base = settings.R2_PUBLIC_URL_BASE
         
+        # Keys of chunks this process uploaded recently, oldest first
+        self._recent_chunk_keys: "OrderedDict[str, None]" = OrderedDict()
+        
         # Validate required settings
         if not settings.R2_ACCESS_KEY_ID:
             raise ValueError("R2_ACCESS_KEY_ID is required but not set")
@@ -36,81 +65,207 @@ class R2StorageService:
                 endpoint_url=self.endpoint_url,
                 aws_access_key_id=settings.R2_ACCESS_KEY_ID,
                 aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-                region_name='auto'  # R2 uses 'auto' as region
+                region_name='auto',  # R2 uses 'auto' as region
+                # One shared client serves every worker and transfer thread
+                config=Config(
+                    max_pool_connections=R2_MAX_POOL_CONNECTIONS,
+                    tcp_keepalive=True,
+                    retries={'mode': 'adaptive', 'max_attempts': 5}
+                )
+            )
+            logger.info(
+                f"✅ R2 client initialized successfully for bucket: {self.bucket_name} "
+                f"(connection pool: {R2_MAX_POOL_CONNECTIONS})"
             )
-            logger.info(f"✅ R2 client initialized successfully for bucket: {self.bucket_name}")
         except Exception as e:
             logger.error(f"Failed to initialize R2 client: {str(e)}")
             raise
+    
+    # boto3 is blocking, so every client call below runs in a worker thread
+    # via asyncio.to_thread to keep the event loop free.
+    
+    def _read_object_text(self, object_key: str) -> str:
+        """Fetch an object and decode its body as UTF-8 (blocking)."""
+        response = self.client.get_object(Bucket=self.bucket_name, Key=object_key)
+        return response['Body'].read().decode('utf-8')
+    
+    def _put_file(self, file_path: str, object_key: str, content_type: str) -> None:
+        """Upload a local file as a single object (blocking)."""
+        with open(file_path, 'rb') as file:
+            self.client.put_object(
+                Bucket=self.bucket_name,
+                Key=object_key,
+                Body=file,
+                ContentType=content_type
+            )
         
     async def upload_chunk(
         self, 
-        file_content: bytes, 
+        file_obj: BinaryIO, 
         room_id: str, 
         user_type: str, 
-        chunk_name: str
-    ) -> Optional[str]:
+        chunk_name: str,
+        metadata: Optional[Dict[str, str]] = None,
+        size: Optional[int] = None
+    ) -> Tuple[Optional[str], bool]:
         """
-        Upload a video chunk to R2 storage.
+        Stream a video chunk to R2 storage.
+        
+        Chunks are immutable once written, so retried uploads are treated as
+        duplicates: keys this process uploaded recently are skipped without
+        a request, and bodies below the multipart threshold go up as a single
+        conditional PUT (If-None-Match: *) that R2 rejects if the key exists.
+        The recent-key cache is per process; the conditional PUT is what
+        catches duplicates sent to other workers.
+        
+        Larger bodies use boto3's managed transfer, which only buffers one
+        part at a time, so the chunk is never read fully into memory. The
+        managed transfer does not accept If-None-Match, so a duplicate of a
+        multipart-sized chunk that reaches another worker overwrites the
+        object with the same bytes and is not reported as skipped.
         
         Args:
-            file_content: Binary content of the chunk file
+            file_obj: Readable binary file object holding the chunk
             room_id: Room ID for the recording
             user_type: Type of user ("host" or "guest")
             chunk_name: Name of the chunk file
+            metadata: Optional user metadata stored on the object (x-amz-meta-*)
+            size: Body size in bytes, if known
             
         Returns:
-            str: R2 object key if successful, None if failed
+            Tuple of (R2 object key, or None if the upload failed; True if
+            the chunk was already stored and nothing was written)
         """
         try:
             # Construct the R2 object key maintaining the folder structure
             object_key = f"{room_id}/{user_type}/{chunk_name}"
             
+            if object_key in self._recent_chunk_keys:
+                logger.info(f"Skipping duplicate chunk upload: {object_key}")
+                return object_key, True
+            
+            extra_args = {'ContentType': 'video/webm'}
+            if metadata:
+                extra_args['Metadata'] = metadata
+            
             # Upload to R2
-            self.client.put_object(
-                Bucket=self.bucket_name,
-                Key=object_key,
-                Body=file_content,
-                ContentType='video/webm'
-            )
+            skipped = False
+            if size is not None and size < CHUNK_TRANSFER_CONFIG.multipart_threshold:
+                try:
+                    await asyncio.to_thread(
+                        self.client.put_object,
+                        Bucket=self.bucket_name,
+                        Key=object_key,
+                        Body=file_obj,
+                        ContentLength=size,
+                        IfNoneMatch='*',
+                        **extra_args
+                    )
+                except ClientError as e:
+                    if e.response.get('Error', {}).get('Code') not in ('PreconditionFailed', '412'):
+                        raise
+                    logger.info(f"Chunk already exists in R2: {object_key}")
+                    skipped = True
+            else:
+                await asyncio.to_thread(
+                    self.client.upload_fileobj,
+                    file_obj,
+                    self.bucket_name,
+                    object_key,
+                    ExtraArgs=extra_args,
+                    Config=CHUNK_TRANSFER_CONFIG
+                )
             
-            logger.info(f"✅ Chunk uploaded to R2: {object_key}")
-            return object_key
+            self._recent_chunk_keys[object_key] = None
+            if len(self._recent_chunk_keys) > RECENT_CHUNK_KEYS_MAX:
+                self._recent_chunk_keys.popitem(last=False)
+            
+            if not skipped:
+                logger.info(f"✅ Chunk uploaded to R2: {object_key}")
+            return object_key, skipped
             
         except Exception as e:
             logger.error(f"Failed to upload chunk to R2: {str(e)}")
-            return None
+            return None, False
+    
+    def generate_chunk_upload_url(
+        self, 
+        room_id: str, 
+        user_type: str, 
+        chunk_name: str, 
+        expires_in: int,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Create a pre-signed PUT URL for uploading a chunk directly to R2.
+        
+        Signing happens locally and makes no network request, so this does
+        not need to run in a worker thread.
+        
+        Args:
+            room_id: Room ID for the recording
+            user_type: Type of user ("host" or "guest")
+            chunk_name: Name of the chunk file
+            expires_in: URL validity in seconds
+            metadata: Optional user metadata to sign into the URL; the client
+                must send it as matching x-amz-meta-* headers
+            
+        Returns:
+            str: Pre-signed upload URL
+        """
+        object_key = f"{room_id}/{user_type}/{chunk_name}"
+        
+        params = {
+            'Bucket': self.bucket_name,
+            'Key': object_key,
+            'ContentType': 'video/webm'
+        }
+        if metadata:
+            params['Metadata'] = metadata
+        
+        return self.client.generate_presigned_url(
+            'put_object',
+            Params=params,
+            ExpiresIn=expires_in
+        )
     
-    async def upload_metadata(
+    async def append_metadata(
         self, 
-        metadata_content: str, 
+        metadata_lines: str, 
         room_id: str, 
         user_type: str
     ) -> Optional[str]:
         """
-        Upload metadata file to R2 storage.
+        Append metadata lines for a room as a new segment object.
+        
+        R2 has no append operation, so rather than rewriting one growing
+        file on every chunk, each call stores its lines in a small object
+        under {room_id}/{user_type}/metadata/. Segment keys start with a
+        nanosecond timestamp, so listing them returns the lines in write order.
         
         Args:
-            metadata_content: Text content of the metadata file
+            metadata_lines: Newline-terminated metadata lines to append
             room_id: Room ID for the recording
             user_type: Type of user ("host" or "guest")
             
         Returns:
-            str: R2 object key if successful, None if failed
+            str: R2 object key of the segment if successful, None if failed
         """
         try:
-            # Construct the R2 object key for metadata
-            object_key = f"{room_id}/{user_type}/{user_type}.txt"
+            # Construct the R2 object key for this segment
+            segment_name = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.csv"
+            object_key = f"{room_id}/{user_type}/metadata/{segment_name}"
             
-            # Upload metadata to R2
-            self.client.put_object(
+            # Upload metadata segment to R2
+            await asyncio.to_thread(
+                self.client.put_object,
                 Bucket=self.bucket_name,
                 Key=object_key,
-                Body=metadata_content.encode('utf-8'),
+                Body=metadata_lines.encode('utf-8'),
                 ContentType='text/plain'
             )
             
-            logger.info(f"✅ Metadata uploaded to R2: {object_key}")
+            logger.info(f"✅ Metadata segment uploaded to R2: {object_key}")
             return object_key
             
         except Exception as e:
@@ -130,10 +285,10 @@ class R2StorageService:
         """
         try:
             # Ensure directory exists
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            await asyncio.to_thread(os.makedirs, os.path.dirname(local_path), exist_ok=True)
             
             # Download from R2
-            self.client.download_file(self.bucket_name, object_key, local_path)
+            await asyncio.to_thread(self.client.download_file, self.bucket_name, object_key, local_path)
             
             logger.info(f"✅ Downloaded chunk from R2: {object_key} -> {local_path}")
             return True
@@ -142,9 +297,19 @@ class R2StorageService:
             logger.error(f"Failed to download chunk from R2: {str(e)}")
             return False
     
+    def _list_keys(self, prefix: str) -> List[str]:
+        """List every object key under a prefix, following pagination (blocking)."""
+        paginator = self.client.get_paginator('list_objects_v2')
+        keys = []
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            keys.extend(obj['Key'] for obj in page.get('Contents', []))
+        return keys
+    
     async def download_metadata(self, room_id: str, user_type: str) -> Optional[str]:
         """
-        Download metadata file content from R2.
+        Download the full metadata content for a room from R2.
+        
+        Concatenates every segment written by append_metadata in write order.
         
         Args:
             room_id: Room ID for the recording
@@ -154,13 +319,15 @@ class R2StorageService:
             str: Metadata content if successful, None if failed
         """
         try:
-            object_key = f"{room_id}/{user_type}/{user_type}.txt"
+            prefix = f"{room_id}/{user_type}/metadata/"
             
-            response = self.client.get_object(Bucket=self.bucket_name, Key=object_key)
-            content = response['Body'].read().decode('utf-8')
+            segment_keys = sorted(await asyncio.to_thread(self._list_keys, prefix))
+            segments = await asyncio.gather(*(
+                asyncio.to_thread(self._read_object_text, key) for key in segment_keys
+            ))
             
-            logger.info(f"✅ Downloaded metadata from R2: {object_key}")
-            return content
+            logger.info(f"✅ Downloaded {len(segment_keys)} metadata segments from R2: {prefix}")
+            return "".join(segments)
             
         except Exception as e:
             logger.error(f"Failed to download metadata from R2: {str(e)}")
@@ -180,7 +347,8 @@ class R2StorageService:
         try:
             prefix = f"{room_id}/{user_type}/"
             
-            response = self.client.list_objects_v2(
+            response = await asyncio.to_thread(
+                self.client.list_objects_v2,
                 Bucket=self.bucket_name,
                 Prefix=prefix
             )
@@ -217,13 +385,7 @@ class R2StorageService:
             object_key = f"{room_id}/final_video.mp4"
             
             # Upload final video to R2
-            with open(file_path, 'rb') as file:
-                self.client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=object_key,
-                    Body=file,
-                    ContentType='video/mp4'
-                )
+            await asyncio.to_thread(self._put_file, file_path, object_key, 'video/mp4')
             
             # Construct public URL if available
             if self.public_url_base:
@@ -252,7 +414,8 @@ class R2StorageService:
             prefix = f"{room_id}/"
             
             # List all objects with the room_id prefix
-            response = self.client.list_objects_v2(
+            response = await asyncio.to_thread(
+                self.client.list_objects_v2,
                 Bucket=self.bucket_name,
                 Prefix=prefix
             )
@@ -270,7 +433,8 @@ class R2StorageService:
                     objects_to_delete.append({'Key': key})
             
             if objects_to_delete:
-                self.client.delete_objects(
+                await asyncio.to_thread(
+                    self.client.delete_objects,
                     Bucket=self.bucket_name,
                     Delete={'Objects': objects_to_delete}
                 )
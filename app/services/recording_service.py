@@ -2,7 +2,7 @@
 Recording service for managing recording sessions, guest tokens, and database operations.
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, insert, update, and_, func, literal
 from sqlalchemy.orm import selectinload
 from app.models.recording import Recording, GuestToken, RecordingStatus
 from app.schemas.recording import (
@@ -38,17 +38,20 @@ class RecordingService:
             # Generate unique room ID
             room_id = str(uuid.uuid4())
             
-            # Create the recording
-            recording = Recording(
-                host_user_id=request.user_id,
-                room_id=room_id,
-                title=request.title or "Untitled Recording",
-                status='created'
+            # Insert and read back server-generated columns in one round trip
+            stmt = (
+                insert(Recording)
+                .values(
+                    host_user_id=request.user_id,
+                    room_id=room_id,
+                    title=request.title or "Untitled Recording",
+                    status=RecordingStatus.CREATED
+                )
+                .returning(Recording)
             )
-            
-            self.db.add(recording)
+            result = await self.db.execute(stmt)
+            recording = result.scalar_one()
             await self.db.commit()
-            await self.db.refresh(recording)
             
             logger.info(f"Created recording {recording.id} with room_id {room_id} for user {request.user_id}")
             return recording
@@ -115,17 +118,22 @@ class RecordingService:
             True if successful, False otherwise
         """
         try:
-            stmt = select(Recording).where(Recording.room_id == room_id)
+            # Single UPDATE ... RETURNING instead of loading the row first
+            stmt = (
+                update(Recording)
+                .where(Recording.room_id == room_id)
+                .values(title=title)
+                .returning(Recording.id)
+            )
             result = await self.db.execute(stmt)
-            recording = result.scalar_one_or_none()
+            recording_id = result.scalar_one_or_none()
+            await self.db.commit()
             
-            if not recording:
+            if recording_id is None:
                 logger.warning(f"Recording with room_id {room_id} not found for title update")
                 return False
             
-            recording.title = title
-            await self.db.commit()
-            logger.info(f"Updated recording {recording.id} title to: {title}")
+            logger.info(f"Updated recording {recording_id} title to: {title}")
             return True
             
         except Exception as e:
@@ -167,37 +175,44 @@ class RecordingService:
             logger.error(f"Error updating recording status for room_id {room_id}: {str(e)}")
             return False
     
-    async def generate_guest_token(self, room_id: str, expires_hours: int = 3) -> str:
+    async def generate_guest_token(self, room_id: str, expires_hours: int = 3) -> Optional[str]:
         """
         Generate a guest token for a recording room.
         
+        Tokens are single-use, so every call issues a new one. The room
+        lookup and the token insert run as a single INSERT ... SELECT, so no
+        row is written when the room does not exist.
+        
         Args:
             room_id: Room ID to generate token for
             expires_hours: Token expiration time in hours
             
         Returns:
-            Generated token string
+            Generated token string, or None if no recording has this room ID
         """
         try:
             # Generate unique token
             token = str(uuid.uuid4())
             expires_at = datetime.utcnow() + timedelta(hours=expires_hours)
             
-            # Get the recording to link the token
-            recording = await self.get_recording_by_room_id(room_id)
-            if not recording:
-                raise ValueError(f"Recording not found for room {room_id}")
-            
-            # Create guest token record
-            guest_token = GuestToken(
-                recording_id=recording.id,
-                token=token,
-                expires_at=expires_at
+            # Link the token to the room's recording in the same statement
+            stmt = (
+                insert(GuestToken)
+                .from_select(
+                    ["recording_id", "token", "expires_at"],
+                    select(Recording.id, literal(token), literal(expires_at))
+                    .where(Recording.room_id == room_id)
+                )
+                .returning(GuestToken.token)
             )
-            
-            self.db.add(guest_token)
+            result = await self.db.execute(stmt)
+            inserted = result.scalar_one_or_none()
             await self.db.commit()
             
+            if inserted is None:
+                logger.warning(f"Recording not found for guest token in room {room_id}")
+                return None
+            
             logger.info(f"Generated guest token for room {room_id}, expires at {expires_at}")
             return token
             
@@ -275,4 +290,4 @@ class RecordingService:
         except Exception as e:
             await self.db.rollback()
             logger.error(f"Error cleaning up expired tokens: {str(e)}")
-            return 0 
\ No newline at end of file
+            return 0
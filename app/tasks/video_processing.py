@@ -9,6 +9,8 @@ from typing import List, Dict, Optional
 import asyncio
 import subprocess
 import glob
+import redis
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.celery_app import celery_app
@@ -19,6 +21,28 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Redis key set while a processing task is queued or running for a room,
+# so repeated recording-stopped events enqueue it only once
+PROCESSING_LOCK_PREFIX = "vp:enq:"
+PROCESSING_LOCK_TTL_SECONDS = 3600
+
+
+def release_processing_lock(room_id: str) -> None:
+    """
+    Allow video processing to be enqueued again for a room.
+    
+    Args:
+        room_id: Room ID of the recording
+    """
+    try:
+        client = redis.Redis.from_url(settings.REDIS_URL)
+        try:
+            client.delete(f"{PROCESSING_LOCK_PREFIX}{room_id}")
+        finally:
+            client.close()
+    except RedisError as e:
+        logger.warning(f"Failed to release processing lock for room {room_id}: {str(e)}")
+
 
 @celery_app.task(bind=True, name="app.tasks.video_processing.process_video")
 def process_video(self, room_id: str, recording_id: str = "", user_id: str = ""):
@@ -54,6 +78,9 @@ def process_video(self, room_id: str, recording_id: str = "", user_id: str = "")
         
         # Re-raise the exception for Celery to handle
         raise
+    
+    finally:
+        release_processing_lock(room_id)
 
 
 # COMMENTED OUT - OLD LOCAL STORAGE METHOD
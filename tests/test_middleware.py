@@ -3,6 +3,12 @@ Tests for custom middleware.
 """
 import pytest
 from fastapi import status
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY, generate_latest
+
+from app.api.dependencies import get_recording_service
+from app.core.config import settings
+from app.main import create_application
 
 
 class TestRequestIdMiddleware:
@@ -30,4 +36,82 @@ class TestRequestIdMiddleware:
         assert response.status_code == status.HTTP_200_OK
         
         # Check that our custom request ID is preserved
-        assert response.headers["X-Request-ID"] == custom_id 
\ No newline at end of file
+        assert response.headers["X-Request-ID"] == custom_id 
+
+
+class _MissingRecordingService:
+    """Recording service stand-in that never finds a recording."""
+
+    in_progress_seen = None
+
+    async def get_recording_by_room_id(self, room_id):
+        _MissingRecordingService.in_progress_seen = REGISTRY.get_sample_value(
+            "http_requests_in_progress",
+            {"method": "GET", "endpoint": "/api/v1/recordings/{room_id}"},
+        )
+        return None
+
+
+class TestRequestMetrics:
+    """Test HTTP request metrics labelling."""
+
+    def test_endpoint_label_is_full_route_template(self):
+        """Test that the endpoint label includes every router prefix."""
+        # create_application() wraps the FastAPI app in the Socket.IO ASGI app
+        app = create_application().other_asgi_app
+        app.dependency_overrides[get_recording_service] = _MissingRecordingService
+        client = TestClient(app)
+
+        response = client.get("/api/v1/recordings/abc")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        exposition = generate_latest().decode()
+        assert (
+            'http_requests_total{endpoint="/api/v1/recordings/{room_id}",'
+            'method="GET",status="404"}'
+        ) in exposition
+
+    def test_in_progress_uses_same_endpoint_label(self):
+        """Test that in-progress requests are counted under the route template."""
+        app = create_application().other_asgi_app
+        app.dependency_overrides[get_recording_service] = _MissingRecordingService
+        client = TestClient(app)
+
+        client.get("/api/v1/recordings/abc")
+
+        assert _MissingRecordingService.in_progress_seen == 1.0
+        assert REGISTRY.get_sample_value(
+            "http_requests_in_progress",
+            {"method": "GET", "endpoint": "/api/v1/recordings/{room_id}"},
+        ) == 0.0
+
+
+class TestRequestBodyLimit:
+    """Test the chunk upload size limit."""
+
+    def test_oversized_body_is_tracked(self, monkeypatch):
+        """Test that a 413 still gets a request ID and is counted."""
+        monkeypatch.setattr(settings, "MAX_CHUNK_BYTES", 10)
+        client = TestClient(create_application().other_asgi_app)
+        labels = {"method": "POST", "endpoint": "unmatched", "status": "413"}
+        before = REGISTRY.get_sample_value("http_requests_total", labels) or 0.0
+
+        response = client.post(
+            "/api/v1/recordings/upload-chunk",
+            content=b"x" * 100,
+            headers={"X-Request-ID": "oversized-1", "Origin": "http://localhost:3000"},
+        )
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert response.headers["X-Request-ID"] == "oversized-1"
+        assert "access-control-allow-origin" in response.headers
+        assert REGISTRY.get_sample_value("http_requests_total", labels) == before + 1
+
+    def test_limit_only_applies_to_chunk_uploads(self, monkeypatch):
+        """Test that other routes are not subject to the chunk size limit."""
+        monkeypatch.setattr(settings, "MAX_CHUNK_BYTES", 10)
+        client = TestClient(create_application().other_asgi_app)
+
+        response = client.post("/api/v1/unknown", content=b"x" * 100)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,93 @@
+"""
+Tests for the R2 storage service.
+"""
+import io
+
+import pytest
+from botocore.stub import ANY, Stubber
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def r2(monkeypatch):
+    """Create an R2 storage service whose client is stubbed."""
+    monkeypatch.setattr(settings, "R2_ACCESS_KEY_ID", "test-access-key")
+    monkeypatch.setattr(settings, "R2_SECRET_ACCESS_KEY", "test-secret-key")
+    monkeypatch.setattr(settings, "R2_ENDPOINT_URL", "https://r2.example.com")
+
+    from app.services.r2_storage import R2StorageService
+
+    service = R2StorageService()
+    with Stubber(service.client) as stubber:
+        yield service, stubber
+        stubber.assert_no_pending_responses()
+
+
+class TestUploadChunk:
+    """Test chunk uploads to R2."""
+
+    async def test_recent_key_is_not_uploaded_again(self, r2):
+        """Test that a chunk uploaded recently is skipped without a request."""
+        service, stubber = r2
+        body = b"chunk-bytes"
+        stubber.add_response(
+            "put_object",
+            {"ETag": '"etag"'},
+            {
+                "Bucket": service.bucket_name,
+                "Key": "room/host/chunk_0.webm",
+                "Body": ANY,
+                "ContentLength": len(body),
+                "IfNoneMatch": "*",
+                "ContentType": "video/webm",
+            },
+        )
+
+        results = [
+            await service.upload_chunk(
+                io.BytesIO(body), "room", "host", "chunk_0.webm", size=len(body)
+            )
+            for _ in range(2)
+        ]
+
+        assert results == [
+            ("room/host/chunk_0.webm", False),
+            ("room/host/chunk_0.webm", True),
+        ]
+
+    async def test_existing_object_counts_as_uploaded(self, r2):
+        """Test that a 412 from the conditional PUT is treated as success."""
+        service, stubber = r2
+        body = b"chunk-bytes"
+        stubber.add_client_error(
+            "put_object",
+            service_error_code="PreconditionFailed",
+            http_status_code=412,
+        )
+
+        result = await service.upload_chunk(
+            io.BytesIO(body), "room", "guest", "chunk_1.webm", size=len(body)
+        )
+
+        assert result == ("room/guest/chunk_1.webm", True)
+
+    async def test_large_chunk_uses_multipart_upload(self, r2):
+        """Test that chunks above the multipart threshold go up in parts."""
+        from app.services.r2_storage import CHUNK_TRANSFER_CONFIG
+
+        service, stubber = r2
+        body = b"\0" * (CHUNK_TRANSFER_CONFIG.multipart_threshold + 1)
+        object_key = "room/host/chunk_2.webm"
+
+        stubber.add_response("create_multipart_upload", {"UploadId": "upload-1"})
+        for _ in range(2):
+            stubber.add_response("upload_part", {"ETag": '"part"'})
+        stubber.add_response("complete_multipart_upload", {})
+
+        result = await service.upload_chunk(
+            io.BytesIO(body), "room", "host", "chunk_2.webm",
+            metadata={"chunk-index": "2"}, size=len(body)
+        )
+
+        assert result == (object_key, False)
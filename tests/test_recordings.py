@@ -0,0 +1,97 @@
+"""
+Tests for recording endpoints.
+"""
+from collections import defaultdict
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import create_application
+from app.services import metadata_buffer
+
+ROOM_ID = "123e4567-e89b-42d3-a456-426614174000"
+
+
+@pytest.fixture
+def client():
+    """Create a test client that does not need a database."""
+    # create_application() wraps the FastAPI app in the Socket.IO ASGI app
+    return TestClient(create_application().other_asgi_app)
+
+
+class TestChunkKeyValidation:
+    """Test that client input cannot escape a chunk's storage prefix."""
+
+    @pytest.mark.parametrize(
+        "room_id,chunk_name",
+        [
+            (ROOM_ID, "../metadata/segment.csv"),
+            (ROOM_ID, "nested/chunk_0.webm"),
+            (ROOM_ID, "chunk_0.txt"),
+            ("../other-room", "chunk_0.webm"),
+            ("room/host", "chunk_0.webm"),
+        ],
+    )
+    def test_upload_url_rejects_unsafe_key_parts(self, client, room_id, chunk_name):
+        """Test that /upload-url rejects room IDs and chunk names outside their formats."""
+        response = client.get(
+            "/api/v1/recordings/upload-url",
+            params={"room_id": room_id, "user_type": "host", "chunk_name": chunk_name},
+        )
+
+        assert response.status_code == 422
+
+    def test_upload_chunk_rejects_unsafe_file_name(self, client):
+        """Test that /upload-chunk rejects a file name that is not a bare chunk name."""
+        response = client.post(
+            "/api/v1/recordings/upload-chunk",
+            files={"file": ("metadata.csv", b"chunk")},
+            data={"room_id": ROOM_ID, "user_type": "host", "chunk_index": "0"},
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Invalid chunk file name"
+
+    def test_upload_chunk_rejects_unsafe_room_id(self, client):
+        """Test that /upload-chunk rejects a room ID outside the UUID format."""
+        response = client.post(
+            "/api/v1/recordings/upload-chunk",
+            files={"file": ("chunk_0.webm", b"chunk")},
+            data={"room_id": "../other-room", "user_type": "host", "chunk_index": "0"},
+        )
+
+        assert response.status_code == 422
+
+
+class _DuplicateChunkStorage:
+    """R2 storage stand-in that reports every chunk as already stored."""
+
+    async def upload_chunk(self, file_obj, room_id, user_type, chunk_name, **kwargs):
+        return f"{room_id}/{user_type}/{chunk_name}", True
+
+
+class TestUploadChunk:
+    """Test the relayed chunk upload endpoint."""
+
+    def test_duplicate_chunk_adds_no_metadata_line(self, client, monkeypatch):
+        """Test that a chunk skipped as a duplicate is not appended to the metadata."""
+        monkeypatch.setattr(settings, "R2_ACCESS_KEY_ID", "test-access-key")
+        monkeypatch.setattr(settings, "R2_SECRET_ACCESS_KEY", "test-secret-key")
+        monkeypatch.setattr(settings, "R2_ENDPOINT_URL", "https://r2.example.com")
+        monkeypatch.setattr(settings, "RECORDING_METADATA_CSV_ENABLED", True)
+
+        from app.services import r2_storage
+
+        monkeypatch.setattr(r2_storage, "r2_storage", _DuplicateChunkStorage())
+        monkeypatch.setattr(metadata_buffer, "_pending", defaultdict(list))
+
+        response = client.post(
+            "/api/v1/recordings/upload-chunk",
+            files={"file": ("chunk_0.webm", b"chunk")},
+            data={"room_id": ROOM_ID, "user_type": "host", "chunk_index": "0"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["duplicate"] is True
+        assert not metadata_buffer._pending